@@ -1,18 +1,43 @@
 #!/usr/bin/env python3
 
+import functools
+import hashlib
+import json
+import os
 import subprocess
+import threading
+from collections import deque
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urlparse
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import time
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin, urlparse, urlunparse
+from bs4 import BeautifulSoup, SoupStrainer
+from lxml import html as lxml_html
+from selectolax.lexbor import LexborHTMLParser
+from urllib.parse import urljoin, urlparse
 import re
 
 
 HEADERS = {
-    "User-Agent": "Mozilla/5.0 (compatible; SJF-Catalog-Extractor/2.5)"
+    "User-Agent": "Mozilla/5.0 (compatible; SJF-Catalog-Extractor/2.5)",
+    "Accept-Encoding": "gzip, deflate, br"
 }
 
+# Shared session so every catalog fetch reuses the same keep-alive
+# connection instead of paying a TCP+TLS handshake per request.
+_SESSION = requests.Session()
+_SESSION.headers.update(HEADERS)
+_ADAPTER = HTTPAdapter(
+    pool_connections=1,
+    pool_maxsize=32,
+    max_retries=Retry(total=3, backoff_factor=0.3)
+)
+_SESSION.mount("https://", _ADAPTER)
+_SESSION.mount("http://", _ADAPTER)
+
 def run_command(command_parts: list[str]) -> tuple[int, str, str]:
     """
     Run a command and capture its output.
@@ -34,15 +59,18 @@ def run_command(command_parts: list[str]) -> tuple[int, str, str]:
         return 1, "", str(e)
 
 
+@functools.lru_cache(maxsize=128)
 def get_base_filename(catalog_url: str) -> str:
     """
     Extract the first two path elements from URL to create a base filename.
     Example: https://catalog.sjf.edu/2025-2026/undergraduate/ug-academic-programs/
     Returns: 2025-2026_undergraduate
     """
-    parsed = urlparse(catalog_url)
-    path_parts = [p for p in parsed.path.split('/') if p]
-    
+    # Cached per URL; split the path off directly rather than building a
+    # ParseResult just to read .path.
+    path = catalog_url.partition("://")[2].partition("/")[2]
+    path_parts = [p for p in path.split('/') if p]
+
     if len(path_parts) >= 2:
         return f"{path_parts[0]}_{path_parts[1]}"
     elif len(path_parts) == 1:
@@ -51,39 +79,190 @@ def get_base_filename(catalog_url: str) -> str:
         return "catalog_summary"
 
 
-def get_filename(catalog_url: str) -> str:
-    """Get base filename from catalog URL."""
-    return get_base_filename(catalog_url)
-
-
 def get_json_filename(catalog_url: str) -> str:
     """Get JSON filename from catalog URL."""
-    return get_filename(catalog_url) + ".json"
+    return get_base_filename(catalog_url) + ".json"
 
 
 def get_ser_filename(catalog_url: str) -> str:
     """Get serialized dictionary filename from catalog URL."""
-    return get_filename(catalog_url) + ".ser"
+    return get_base_filename(catalog_url) + ".ser"
+
+
+# Compiled once; both run while extracting prerequisites from every
+# course on every course page.
+PREREQ_LABEL_RE = re.compile(r'Pre-requisites?', re.IGNORECASE)
+WHITESPACE_RE = re.compile(r'\s+')
+
+# The sidebar helpers only ever look inside <div id="sidebar">, so let
+# the parser skip the rest of the document during tree construction.
+SIDEBAR_ONLY = SoupStrainer("div", id="sidebar")
+
+class _RateLimiter:
+    """Token-bucket pacing: permit short bursts but bound the average request rate."""
+
+    def __init__(self, rate: int, per: float = 1.0):
+        self.rate = rate
+        self.per = per
+        self._timestamps = deque()
+        self._lock = threading.Lock()
+
+    def wait(self):
+        """Block until a request slot is available, then claim it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                while self._timestamps and now - self._timestamps[0] >= self.per:
+                    self._timestamps.popleft()
+                if len(self._timestamps) < self.rate:
+                    self._timestamps.append(now)
+                    return
+                delay = self.per - (now - self._timestamps[0])
+            time.sleep(delay)
+
+
+# 10 requests/second against the catalog host, shared by all workers.
+_RATE_LIMITER = _RateLimiter(rate=10, per=1.0)
 
+# Pages fetched this run, keyed by normalized URL. The pipeline visits
+# the same school/program pages several times; cache hits skip both the
+# GET and the rate limiter.
+_HTML_CACHE: dict[str, bytes] = {}
 
-def fetch_html(url: str) -> str:
+# Conditional-GET state across runs: a sidecar index of validators per
+# URL, with the matching response bodies stored under .http_cache/.
+# Catalog pages rarely change, so repeat runs mostly see 304s and skip
+# the body transfer entirely. Responses without validators are still
+# cached and reused as-is until _HTTP_CACHE_TTL expires.
+_HTTP_CACHE_DIR = ".http_cache"
+_HTTP_CACHE_INDEX = ".http_cache.json"
+_HTTP_CACHE_TTL = 86400  # seconds a validator-less entry stays fresh
+_HTTP_CACHE_LOCK = threading.Lock()
+
+def _load_http_cache_index() -> dict:
+    try:
+        with open(_HTTP_CACHE_INDEX, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+_HTTP_CACHE_META = _load_http_cache_index()
+
+def _http_cache_body_path(cache_key: str) -> str:
+    digest = hashlib.sha1(cache_key.encode()).hexdigest()
+    return os.path.join(_HTTP_CACHE_DIR, f"{digest}.html")
+
+def _save_http_cache_entry(cache_key: str, body: bytes, etag: str, last_modified: str):
+    """Persist a response body plus its validators for conditional GETs."""
+    with _HTTP_CACHE_LOCK:
+        try:
+            os.makedirs(_HTTP_CACHE_DIR, exist_ok=True)
+            with open(_http_cache_body_path(cache_key), 'wb') as f:
+                f.write(body)
+            _HTTP_CACHE_META[cache_key] = {
+                "etag": etag,
+                "last_modified": last_modified,
+                "fetched_at": time.time()
+            }
+            with open(_HTTP_CACHE_INDEX, 'w', encoding='utf-8') as f:
+                json.dump(_HTTP_CACHE_META, f)
+        except OSError:
+            pass
+
+# Per-URL in-flight locks so pool workers racing on the same page
+# share one network call instead of all missing the cache at once.
+_FETCH_LOCKS: dict[str, threading.Lock] = {}
+_FETCH_LOCKS_GUARD = threading.Lock()
+
+def fetch_html(url: str) -> bytes:
+    cache_key = normalize_url(url)
+    if cache_key in _HTML_CACHE:
+        return _HTML_CACHE[cache_key]
+
+    with _FETCH_LOCKS_GUARD:
+        lock = _FETCH_LOCKS.setdefault(cache_key, threading.Lock())
+
+    with lock:
+        return _fetch_html_locked(url, cache_key)
+
+
+def _fetch_html_locked(url: str, cache_key: str) -> bytes:
+    # Another worker may have fetched this page while we waited.
+    if cache_key in _HTML_CACHE:
+        return _HTML_CACHE[cache_key]
     try:
-        r = requests.get(url, headers=HEADERS, timeout=20)
+        conditional_headers = {}
+        meta = _HTTP_CACHE_META.get(cache_key)
+        if meta:
+            if meta.get("etag"):
+                conditional_headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                conditional_headers["If-Modified-Since"] = meta["last_modified"]
+            if not conditional_headers:
+                # No validators to revalidate with: trust the cached body
+                # until its TTL runs out.
+                if time.time() - meta.get("fetched_at", 0) < _HTTP_CACHE_TTL:
+                    try:
+                        with open(_http_cache_body_path(cache_key), 'rb') as f:
+                            body = f.read()
+                        _HTML_CACHE[cache_key] = body
+                        return body
+                    except OSError:
+                        pass
+
+        _RATE_LIMITER.wait()
+        r = _SESSION.get(url, timeout=20, headers=conditional_headers)
+
+        if r.status_code == 304:
+            try:
+                with open(_http_cache_body_path(cache_key), 'rb') as f:
+                    body = f.read()
+                _HTML_CACHE[cache_key] = body
+                return body
+            except OSError:
+                # Cached body vanished; refetch unconditionally.
+                r = _SESSION.get(url, timeout=20)
+
         r.raise_for_status()
-        time.sleep(0.5)
-        return r.text
+        # Return raw bytes: lxml, Lexbor and BeautifulSoup all sniff the
+        # encoding themselves, so decoding to str here is wasted work.
+        body = r.content
+        _save_http_cache_entry(cache_key, body,
+                               r.headers.get("ETag"),
+                               r.headers.get("Last-Modified"))
+        _HTML_CACHE[cache_key] = body
+        return body
     except requests.RequestException as e:
         print(f"      ⚠️  Error fetching {url}: {e}")
         return None
     
 
-def get_sidebar_ul_links(page_url: str) -> list[dict]:
-    """Extract links from sidebar ul elements."""
-    html = fetch_html(page_url)
-    if not html:
-        return []
-    soup = BeautifulSoup(html, "html.parser")
-    
+# Parsed trees for pages that get queried repeatedly (find_link /
+# find_links); mirrors _HTML_CACHE one level up. Failures aren't cached
+# so a later call can retry.
+_SOUP_CACHE: dict[str, BeautifulSoup] = {}
+
+def get_soup(url: str) -> BeautifulSoup:
+    """Fetch and parse a page once; repeated queries reuse the same tree."""
+    cache_key = normalize_url(url)
+    soup = _SOUP_CACHE.get(cache_key)
+    if soup is None:
+        html = fetch_html(url)
+        if not html:
+            return None
+        soup = BeautifulSoup(html, "lxml")
+        _SOUP_CACHE[cache_key] = soup
+    return soup
+
+
+def get_sidebar_ul_links(page_url: str, soup: BeautifulSoup = None) -> list[dict]:
+    """Extract links from sidebar ul elements. Pass a pre-parsed soup to skip the fetch."""
+    if soup is None:
+        html = fetch_html(page_url)
+        if not html:
+            return []
+        soup = BeautifulSoup(html, "lxml", parse_only=SIDEBAR_ONLY)
+
     sidebar = soup.find("div", id="sidebar")
     if not sidebar:
         return []
@@ -107,72 +286,123 @@ def get_sidebar_ul_links(page_url: str) -> list[dict]:
 
 def find_link(page_url: str, link_text_substring: str) -> str | None:
     """Find a link containing the specified substring."""
-    html = fetch_html(page_url)
-    if not html:
+    soup = get_soup(page_url)
+    if soup is None:
         return None
 
     try:
-        soup = BeautifulSoup(html, "html.parser")
-        
-        for a in soup.find_all("a", href=True):
-            link_text = a.get_text(strip=True)
-            if link_text_substring.lower() in link_text.lower():
-                return urljoin(page_url, a["href"])
-        
-        return None
+        # soup.find stops the tree walk at the first hit, unlike
+        # find_all which materializes every anchor first.
+        needle = link_text_substring.lower()
+        a = soup.find(
+            lambda t: t.name == "a" and t.has_attr("href")
+            and needle in t.get_text(strip=True).lower()
+        )
+        return urljoin(page_url, a["href"]) if a else None
     except Exception as e:
         print(f"      ⚠️  Error finding '{link_text_substring}' on {page_url}: {e}")
         return None
 
+def find_links(page_url: str, substrings: list[str]) -> dict:
+    """Find links for several substrings with a single fetch and parse.
+
+    Returns a dict mapping each substring to the first matching link
+    URL, or None if no link matched it.
+    """
+    results = {s: None for s in substrings}
+    soup = get_soup(page_url)
+    if soup is None:
+        return results
+
+    try:
+        pending = len(results)
+        for a in soup.find_all("a", href=True):
+            link_text = a.get_text(strip=True).lower()
+            for substring in substrings:
+                if results[substring] is None and substring.lower() in link_text:
+                    results[substring] = urljoin(page_url, a["href"])
+                    pending -= 1
+            if not pending:
+                # Every needle resolved; skip the rest of the anchors.
+                break
+
+        return results
+    except Exception as e:
+        print(f"      ⚠️  Error finding links on {page_url}: {e}")
+        return results
+
+# Extraction results keyed by a digest of the page bytes: shared
+# programs often serve byte-identical courses pages under different
+# URLs, and those collapse to a single parse.
+_COURSE_TITLES_BY_DIGEST: dict[bytes, list[dict]] = {}
+
 def extract_course_titles(courses_url: str) -> list[dict]:
     """Extract course titles and prerequisites from courses page."""
     html = fetch_html(courses_url)
     if not html:
         return []
-    
+
+    digest = hashlib.blake2b(html, digest_size=16).digest()
+    cached = _COURSE_TITLES_BY_DIGEST.get(digest)
+    if cached is not None:
+        return cached
+
     try:
-        soup = BeautifulSoup(html, "html.parser")
+        tree = LexborHTMLParser(html)
         course_data = []
-        
-        for h3 in soup.find_all("h3", class_="maryann_course_title"):
-            title = h3.get_text(strip=True)
+
+        for h3 in tree.css("h3.maryann_course_title"):
+            title = h3.text(strip=True)
             if not title:
                 continue
-            
+
             cleaned_title = remove_parenthetical(title)
             if not cleaned_title:
                 continue
-            
+
             parts = cleaned_title.split(" ", 1)
             course_id = ""
             course_title = ""
-            
+
             if len(parts) == 2:
                 course_id = parts[0].strip()
                 course_title = parts[1].strip()
             elif len(parts) == 1:
                 course_id = parts[0].strip()
                 course_title = ""
-            
+
             prerequisites = None
-            li_parent = h3.find_parent("li")
-            if li_parent:
-                prereq_span = li_parent.find("span", string=re.compile(r'Pre-requisites?', re.IGNORECASE))
-                
+            li_parent = h3.parent
+            while li_parent is not None and li_parent.tag != "li":
+                li_parent = li_parent.parent
+            if li_parent is not None:
+                prereq_span = None
+                span_text = ""
+                label_match = None
+                for span in li_parent.css("span"):
+                    span_text = span.text()
+                    label_match = PREREQ_LABEL_RE.search(span_text)
+                    if label_match:
+                        prereq_span = span
+                        break
+
                 if prereq_span:
-                    next_sibling = prereq_span.next_sibling
-                    prereq_text = ""
-                    
-                    if next_sibling and isinstance(next_sibling, str):
-                        prereq_text = next_sibling.strip()
-                    elif prereq_span.parent:
-                        parent_text = prereq_span.parent.get_text()
-                        if "Pre-requisites" in parent_text or "Pre-requisite" in parent_text:
-                            parts = re.split(r'Pre-requisites?:?\s*', parent_text, flags=re.IGNORECASE)
-                            if len(parts) > 1:
-                                prereq_text = parts[1].strip()
-                                prereq_text = prereq_text.split('\n')[0].strip()
-                    
+                    # Walk forward from the label, collecting inline text
+                    # until a block boundary, instead of re-serializing
+                    # and re-splitting the whole parent's text. The label
+                    # span can carry the prerequisite text itself
+                    # ("Pre-requisites: BIOL 101"), so seed the pieces
+                    # with its own tail before walking siblings.
+                    pieces = [span_text[label_match.end():].lstrip(':')]
+                    node = prereq_span.next
+                    while node is not None and node.tag not in ("br", "p", "h3", "li"):
+                        if node.tag == "-text":
+                            pieces.append(node.text_content or "")
+                        else:
+                            pieces.append(node.text() or "")
+                        node = node.next
+
+                    prereq_text = WHITESPACE_RE.sub(" ", "".join(pieces)).strip()
                     if prereq_text:
                         prerequisites = prereq_text
             
@@ -181,7 +411,8 @@ def extract_course_titles(courses_url: str) -> list[dict]:
                 "course_title": course_title,
                 "prerequisites": prerequisites
             })
-        
+
+        _COURSE_TITLES_BY_DIGEST[digest] = course_data
         return course_data
     except Exception as e:
         print(f"        ⚠️  Error extracting course titles from {courses_url}: {e}")
@@ -192,19 +423,104 @@ def discover_candidate_school_urls(page_url: str) -> list[str]:
     html = fetch_html(page_url)
     if not html:
         return []
-    soup = BeautifulSoup(html, "html.parser")
 
     year_root = get_year_root(page_url)
 
-    candidates = set()
-    for a in soup.find_all("a", href=True):
-        abs_url = urljoin(page_url, a["href"])
-        if not abs_url.startswith(year_root):
-            continue
-        path = urlparse(abs_url).path
-        candidates.add(normalize_url(abs_url))
+    # urljoin is pure Python and runs once per anchor; resolve the two
+    # common href shapes (absolute, root-relative) with string ops and
+    # keep urljoin only for the odd relative/query cases.
+    p = urlparse(page_url)
+    origin = f"{p.scheme}://{p.netloc}"
+
+    # lxml hands back href strings directly — no BS4 node objects — and
+    # a set dedupes the normalized URLs before the sorted() below.
+    seen = set()
+    for href in lxml_html.fromstring(html).xpath("//a/@href"):
+        if href.startswith(("http://", "https://")):
+            abs_url = href
+        elif href.startswith("/") and not href.startswith("//"):
+            abs_url = origin + href
+        else:
+            abs_url = urljoin(page_url, href)
+        if abs_url.startswith(year_root):
+            seen.add(normalize_url(abs_url))
+
+    return sorted(seen)
+
+
+@dataclass(slots=True)
+class CourseRecord:
+    """One per-course row from the shared catalog crawl.
+
+    Slots instead of a per-record dict: a catalog run produces thousands
+    of these, and fixed slots cut the per-record footprint while keeping
+    attribute access cheap.
+    """
+    school_url: str
+    program_name: str
+    prog_req_link: str
+    courses_link: str
+    course_id: str
+    course_title: str
+    prerequisites: str
+
+
+def _crawl_program(task: tuple[str, dict]) -> list[CourseRecord]:
+    """Crawl one program nav link into per-course records."""
+    school_url, nav_link = task
+    links = find_links(nav_link['url'], ["Program Requirements", "Courses"])
+    prog_req_link = links["Program Requirements"]
+    if not prog_req_link:
+        return []
+
+    courses_link = links["Courses"]
+    if not courses_link:
+        return []
+
+    return [
+        CourseRecord(
+            school_url=school_url,
+            program_name=nav_link['text'],
+            prog_req_link=prog_req_link,
+            courses_link=courses_link,
+            **course
+        )
+        for course in extract_course_titles(courses_link)
+    ]
 
-    return sorted(candidates)
+
+def crawl_catalog(school_urls: list[str], max_workers: int = 16) -> list[CourseRecord]:
+    """Crawl every school's programs once and return per-course records.
+
+    Each record carries the school URL, program name, Program
+    Requirements / Courses links and the course fields from
+    extract_course_titles, so every consumer (dictionary build, summary,
+    display) can share a single crawl instead of re-walking the site.
+    """
+    # One bounded pool for the whole crawl: resolve every school's
+    # sidebar first, then fan out one task per nav link so all page
+    # fetches across all schools overlap. The token bucket keeps the
+    # request rate polite.
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        sidebar_results = pool.map(get_sidebar_ul_links, school_urls)
+
+        # Sidebars can list the same program page twice; dedupe tasks up
+        # front so no page is crawled (or reported) more than once per
+        # school.
+        tasks = []
+        seen = set()
+        for school_url, nav_links in zip(school_urls, sidebar_results):
+            for nav_link in nav_links:
+                key = (school_url, normalize_url(nav_link['url']))
+                if key not in seen:
+                    seen.add(key)
+                    tasks.append((school_url, nav_link))
+
+        return [
+            record
+            for records in pool.map(_crawl_program, tasks)
+            for record in records
+        ]
 
 
 def filter_urls_by_sidebar(page_url: str, urls: list[str]) -> list[str]:
@@ -212,8 +528,11 @@ def filter_urls_by_sidebar(page_url: str, urls: list[str]) -> list[str]:
     return [u for u in urls if normalize_url(u) in sidebar_links]
 
 
+@functools.lru_cache(maxsize=1024)
 def get_year_root(page_url: str) -> str:
     """Extract the catalog year root."""
+    # Cached: pure string work, recomputed for the same catalog page on
+    # every discovery call.
     p = urlparse(page_url)
     parts = [seg for seg in p.path.split("/") if seg]
     if not parts:
@@ -221,50 +540,72 @@ def get_year_root(page_url: str) -> str:
     year = parts[0]
     return f"{p.scheme}://{p.netloc}/{year}/"
 
+@functools.lru_cache(maxsize=65536)
 def normalize_url(u: str) -> str:
     """Normalize URL for reliable comparison (drop query/fragment, unify trailing slash)."""
+    # Cached: the same hrefs recur across shared sidebars and cross-links.
     p = urlparse(u.strip())
     scheme = p.scheme.lower()
     netloc = p.netloc.lower()
     path = p.path or "/"
-    if not path.endswith("/"):
-        if "." not in path.split("/")[-1]:
-            path = path + "/"
-    return urlunparse((scheme, netloc, path, "", "", ""))
+    if not path.endswith("/") and "." not in path.rpartition("/")[2]:
+        path = path + "/"
+    return f"{scheme}://{netloc}{path}"
+
+def get_sidebar_links(page_url: str, debug: bool = False, soup: BeautifulSoup = None) -> set[str]:
+    if soup is not None:
+        # Caller already holds a parsed soup; walk it directly.
+        sidebar = soup.find("div", id="sidebar")
+        if not sidebar:
+            if debug:
+                print("⚠️  No sidebar found!")
+            return set()
+        return {
+            normalize_url(urljoin(page_url, a["href"]))
+            for a in sidebar.find_all("a", href=True)
+            if 'school' in a.get_text(strip=True).lower()
+        }
 
-def get_sidebar_links(page_url: str, debug: bool = False) -> set[str]:
     html = fetch_html(page_url)
     if not html:
         return set()
-    
-    soup = BeautifulSoup(html, "html.parser")
-    sidebar = soup.find("div", id="sidebar")
-    
-    if not sidebar:
+
+    doc = lxml_html.fromstring(html)
+    if not doc.xpath("//div[@id='sidebar']"):
         if debug:
             print("⚠️  No sidebar found!")
         return set()
-    
+
     if debug:
         print(f"✓ Sidebar found, scanning for links...")
-    
+
+    # The 'school' filter runs inside lxml's compiled XPath engine
+    # instead of lowercasing and substring-testing each anchor in Python.
+    anchors = doc.xpath(
+        "//div[@id='sidebar']//a[@href]"
+        "[contains(translate(string(.), 'SCHOOL', 'school'), 'school')]"
+    )
+
     links = set()
-    for a in sidebar.find_all("a", href=True):
-        link_text = a.get_text(strip=True)
+    for a in anchors:
+        abs_url = urljoin(page_url, a.get("href"))
+        links.add(normalize_url(abs_url))
         if debug:
-            print(f"  Found link: '{link_text}'")
-        
-        if 'school' in link_text.lower():
-            abs_url = urljoin(page_url, a["href"])
-            links.add(normalize_url(abs_url))
-            if debug:
-                print(f"    ✓ Matched! Added: {abs_url}")
-    
+            print(f"    ✓ Matched! Added: {abs_url}")
+
     return links
 
 def remove_parenthetical(text: str) -> str:
-    """Remove parenthetical phrases from text."""
-    while '(' in text:
-        text = re.sub(r'\([^()]*\)', '', text)
-    text = re.sub(r'\s+', ' ', text).strip()
-    return text
\ No newline at end of file
+    """Remove parenthetical phrases (including nested ones) from text."""
+    # Single left-to-right pass with a depth counter instead of repeated
+    # regex substitution passes for each nesting level.
+    out = []
+    depth = 0
+    for ch in text:
+        if ch == '(':
+            depth += 1
+        elif ch == ')':
+            depth = max(0, depth - 1)
+        elif depth == 0:
+            out.append(ch)
+    return WHITESPACE_RE.sub(' ', ''.join(out)).strip()
\ No newline at end of file
@@ -1,8 +1,9 @@
 #!/usr/bin/env python3
 
 import sys
-import json
+import orjson
 import os
+from xml.sax.saxutils import escape
 from reportlab.lib.pagesizes import letter
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
@@ -17,11 +18,11 @@ def load_json_summary(filename: str) -> dict:
         sys.exit(1)
     
     try:
-        with open(filename, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        with open(filename, 'rb') as f:
+            data = orjson.loads(f.read())
         print(f"✓ Loaded catalog summary from {filename}")
         return data
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         print(f"❌ Error parsing JSON file: {e}")
         sys.exit(1)
     except Exception as e:
@@ -103,16 +104,12 @@ def create_catalog_pdf(data: dict, pdf_filename: str):
         alignment=TA_LEFT
     )
     
-    indent_style = ParagraphStyle(
-        'CustomIndent',
-        parent=styles['Normal'],
-        fontSize=9,
-        textColor='black',
-        leftIndent=80,
-        spaceAfter=2,
-        alignment=TA_LEFT
-    )
-    
+    # Constant flowables reused across loop iterations; ReportLab
+    # re-wraps a Paragraph on every layout, so sharing instances is safe
+    # and skips re-parsing the same inline markup per program.
+    prog_courses_header = Paragraph("Program Courses:", heading3_style)
+    req_not_available = Paragraph("Requirement Courses: Not available", heading3_style)
+
     # Title
     catalog_url = data.get('catalog_url', 'Unknown')
     total_courses = data.get('total_courses', 0)
@@ -167,38 +164,37 @@ def create_catalog_pdf(data: dict, pdf_filename: str):
                     heading3_style
                 ))
             else:
-                elements.append(Paragraph(
-                    "Requirement Courses: Not available",
-                    heading3_style
-                ))
+                elements.append(req_not_available)
             
             elements.append(Spacer(1, 0.05*inch))
             elements.append(Paragraph(f"Courses URL: {courses_url}", heading3_style))
-            elements.append(Paragraph("Program Courses:", heading3_style))
+            elements.append(prog_courses_header)
             elements.append(Spacer(1, 0.05*inch))
             
-            # Program courses
+            # Program courses: one merged Paragraph per program rather
+            # than one flowable per course/prerequisite line, which keeps
+            # ReportLab's flowable list (and layout time) small.
+            course_lines = []
             for course in program_courses:
                 course_id = course.get('course_id', 'Unknown')
                 course_title = course.get('course_title', 'Unknown')
                 prerequisites = course.get('prerequisites', [])
-                
-                elements.append(Paragraph(
-                    f'• "{course_id}", "{course_title}"',
-                    body_style
-                ))
-                
+
+                course_lines.append(f'• "{escape(course_id)}", "{escape(course_title)}"')
+
                 # Prerequisites
                 if prerequisites:
-                    elements.append(Paragraph("Prerequisites:", indent_style))
+                    course_lines.append('&nbsp;&nbsp;&nbsp;&nbsp;Prerequisites:')
                     for prereq in prerequisites:
                         prereq_id = prereq.get('course_id', 'Unknown')
                         prereq_title = prereq.get('course_title', 'Unknown')
-                        elements.append(Paragraph(
-                            f'- "{prereq_id}": "{prereq_title}"',
-                            indent_style
-                        ))
-            
+                        course_lines.append(
+                            f'&nbsp;&nbsp;&nbsp;&nbsp;- "{escape(prereq_id)}": "{escape(prereq_title)}"'
+                        )
+
+            if course_lines:
+                elements.append(Paragraph('<br/>'.join(course_lines), body_style))
+
             elements.append(Spacer(1, 0.1*inch))
         
         # Add page break between schools (except for the last one)
@@ -213,6 +209,13 @@ def create_catalog_pdf(data: dict, pdf_filename: str):
         print(f"❌ Error creating PDF: {e}")
         sys.exit(1)
 
+def main(json_filename: str):
+    """Load a summary JSON file and render the catalog PDF."""
+    catalog_data = load_json_summary(json_filename)
+    pdf_filename = get_pdf_filename(json_filename)
+    print(f"Creating PDF: {pdf_filename}")
+    create_catalog_pdf(catalog_data, pdf_filename)
+
 if __name__ == "__main__":
     # Check for JSON filename argument
     if len(sys.argv) < 2:
@@ -220,16 +223,5 @@ if __name__ == "__main__":
         print("\nExample:")
         print("  python create_catalog_summary_pdf.py 2025-2026_undergraduate.json")
         sys.exit(1)
-    
-    json_filename = sys.argv[1]
-    
-    # Load JSON data
-    catalog_data = load_json_summary(json_filename)
-    
-    # Generate PDF filename
-    pdf_filename = get_pdf_filename(json_filename)
-    
-    print(f"Creating PDF: {pdf_filename}")
-    
-    # Create the PDF
-    create_catalog_pdf(catalog_data, pdf_filename)
\ No newline at end of file
+
+    main(sys.argv[1])
\ No newline at end of file
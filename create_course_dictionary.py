@@ -1,25 +1,35 @@
 #!/usr/bin/env python3
 
-import re
 import sys
-import pickle
+import orjson
 import os
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin, urlparse, urlunparse
 from catalog_util import (
     get_ser_filename,
-    get_sidebar_ul_links,
-    find_link,
-    extract_course_titles,
+    crawl_catalog,
     discover_candidate_school_urls,
     filter_urls_by_sidebar,
 )
 
+# Deletes spaces and hyphens in one C pass, matching the normalization
+# the summary scripts apply when resolving course codes.
+_STRIP_SEPARATORS = str.maketrans('', '', ' -')
+
+
 def save_course_dictionary(course_dict: dict, filename: str):
-    """Save the course dictionary to a file using pickle serialization."""
+    """Save the course dictionary and its normalized-key index to a file."""
+    # The normalized index is persisted alongside the dictionary so the
+    # summary scripts load it instead of re-normalizing every key on
+    # each startup.
+    payload = {
+        "courses": course_dict,
+        "normalized_index": {
+            cid.translate(_STRIP_SEPARATORS).upper(): cid
+            for cid in course_dict
+        },
+    }
     try:
         with open(filename, 'wb') as f:
-            pickle.dump(course_dict, f)
+            f.write(orjson.dumps(payload))
         print(f"✓ Course dictionary saved to {filename}")
     except Exception as e:
         print(f"⚠️  Error saving course dictionary: {e}")
@@ -30,7 +40,10 @@ def load_course_dictionary(filename: str) -> dict:
     if os.path.exists(filename):
         try:
             with open(filename, 'rb') as f:
-                course_dict = pickle.load(f)
+                data = orjson.loads(f.read())
+            # Legacy files hold the bare dictionary; current files wrap
+            # it with the precomputed normalized index.
+            course_dict = data["courses"] if "courses" in data and "normalized_index" in data else data
             print(f"✓ Loaded course dictionary from {filename} ({len(course_dict)} courses)")
             return course_dict
         except Exception as e:
@@ -40,19 +53,14 @@ def load_course_dictionary(filename: str) -> dict:
     else:
         print(f"ℹ️  No existing course dictionary found at {filename}")
         return {}
-    
 
-if __name__ == "__main__":
-    # Accept URL from command line or use default
-    if len(sys.argv) > 1:
-        CATALOG_PAGE_WITH_SIDEBAR = sys.argv[1]
-    else:
-        CATALOG_PAGE_WITH_SIDEBAR = "https://catalog.sjf.edu/2025-2026/"
-    
-    print(f"Analyzing: {CATALOG_PAGE_WITH_SIDEBAR}\n")
+
+def main(catalog_url: str):
+    """Build (or load) the course dictionary for one catalog URL."""
+    print(f"Analyzing: {catalog_url}\n")
 
     # Get the serialized filename based on the catalog URL
-    COURSE_DICT_FILE = get_ser_filename(CATALOG_PAGE_WITH_SIDEBAR)
+    COURSE_DICT_FILE = get_ser_filename(catalog_url)
 
     # Try to load existing course dictionary
     course_dictionary = load_course_dictionary(COURSE_DICT_FILE)
@@ -62,10 +70,10 @@ if __name__ == "__main__":
         print("Building course dictionary from catalog...\n")
         
         # Discover and filter school URLs
-        YOUR_URLS = discover_candidate_school_urls(CATALOG_PAGE_WITH_SIDEBAR)
-        
+        YOUR_URLS = discover_candidate_school_urls(catalog_url)
+
         try:
-            filtered = filter_urls_by_sidebar(CATALOG_PAGE_WITH_SIDEBAR, YOUR_URLS)
+            filtered = filter_urls_by_sidebar(catalog_url, YOUR_URLS)
         except Exception as e:
             print(f"Error: {e}")
             raise
@@ -74,23 +82,11 @@ if __name__ == "__main__":
         print("=" * 80)
         print("\n🔍 PHASE 1: Building course dictionary...\n")
         
-        for school_url in filtered:
-            sidebar_links = get_sidebar_ul_links(school_url)
-            
-            if not sidebar_links:
-                continue
-            
-            for nav_link in sidebar_links:
-                prog_req_link = find_link(nav_link['url'], "Program Requirements")
-                
-                if prog_req_link:
-                    courses_link = find_link(nav_link['url'], "Courses")
-                    if courses_link:
-                        course_data = extract_course_titles(courses_link)
-                        
-                        for course in course_data:
-                            course_dictionary[course["course_id"]] = course["course_title"]
-        
+        # One crawl pass shared with the summary scripts; derive the
+        # dictionary from the per-course records it returns.
+        for course in crawl_catalog(filtered):
+            course_dictionary.setdefault(course.course_id, course.course_title)
+
         print(f"✓ Built course dictionary with {len(course_dictionary)} unique courses\n")
         
         # Save the course dictionary
@@ -98,4 +94,6 @@ if __name__ == "__main__":
     else:
         print("Course dictionary already exists and was loaded successfully.")
 
-        
\ No newline at end of file
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else "https://catalog.sjf.edu/2025-2026/")
\ No newline at end of file
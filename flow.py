@@ -1,29 +1,105 @@
 #!/usr/bin/env python3
 
+import io
+import importlib
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
 from catalog_util import (
     run_command,
     get_base_filename,
-    get_json_filename
+    get_json_filename,
+    get_ser_filename
 )
+import create_course_dictionary
+import get_catalog_summary_json
+import print_catalog_summary
+# Imported up front so forked pool workers inherit the warm modules.
+import create_catalog_summary_pdf
+import create_summary_graph
+import get_dependencies_pdf
+
+
+def up_to_date(out: str, inp: str) -> bool:
+    """Return True if out exists and is at least as new as inp (make-style)."""
+    return (
+        os.path.exists(out)
+        and os.path.exists(inp)
+        and os.path.getmtime(out) >= os.path.getmtime(inp)
+    )
+
+
+def run_step(func, *args) -> tuple[bool, str]:
+    """Run one pipeline stage in-process, reporting failure instead of exiting.
+
+    The stage modules call sys.exit on fatal errors when run standalone;
+    catch that here so one stage failing doesn't bypass flow's own
+    per-step handling.
+    """
+    try:
+        func(*args)
+        return True, ""
+    except SystemExit as e:
+        if e.code in (None, 0):
+            return True, ""
+        return False, f"stage exited with status {e.code}"
+    except Exception as e:
+        return False, str(e)
+
+
+def run_stage_captured(module_name: str, arg: str) -> tuple[bool, str, str]:
+    """Run one stage in a worker process with its stdout captured.
+
+    Capturing keeps the console readable when stages run concurrently:
+    the parent prints each stage's banner and output in order once the
+    futures resolve.
+    """
+    buffer = io.StringIO()
+    try:
+        module = importlib.import_module(module_name)
+        with redirect_stdout(buffer):
+            module.main(arg)
+        return True, "", buffer.getvalue()
+    except SystemExit as e:
+        if e.code in (None, 0):
+            return True, "", buffer.getvalue()
+        return False, f"stage exited with status {e.code}", buffer.getvalue()
+    except Exception as e:
+        return False, str(e), buffer.getvalue()
+
+
+def run_graph_stages(json_filename: str, dot_filename: str, svg_filename: str):
+    """Generate the DOT graph, then chain the Graphviz SVG render."""
+    ok, error, output = run_stage_captured("create_summary_graph", json_filename)
+    if not ok:
+        return ok, error, output, None, ""
+
+    returncode, stdout, stderr = run_command(["dot", "-Tsvg", dot_filename, "-o", svg_filename])
+    if stdout:
+        output += stdout
+    return ok, error, output, returncode, stderr
 
 
 def main():
     # Check for catalog URL argument
-    if len(sys.argv) < 2:
-        print("Usage: python flow.py <catalog_url>")
+    force = "--force" in sys.argv[1:]
+    args = [arg for arg in sys.argv[1:] if arg != "--force"]
+    if not args:
+        print("Usage: python flow.py <catalog_url> [--force]")
         print("\nExample:")
         print("  python flow.py https://catalog.sjf.edu/2025-2026/undergraduate/ug-academic-programs/")
         sys.exit(1)
 
-    catalog_url = sys.argv[1]
+    catalog_url = args[0]
     base_filename = get_base_filename(catalog_url)
+    ser_filename = get_ser_filename(catalog_url)
     json_filename = get_json_filename(catalog_url)
     pdf_filename = f"{base_filename}.pdf"
     dot_filename = f"{base_filename}.dot"
     svg_filename = f"{base_filename}.svg"
     dependencies_pdf_filename = f"{base_filename}_dependencies.pdf"
-    
+
     print("=" * 80)
     print("CATALOG ANALYSIS WORKFLOW")
     print("=" * 80)
@@ -33,86 +109,114 @@ def main():
     print(f"DOT Output:  {dot_filename}")
     print(f"SVG Output:  {svg_filename}")
     print(f"Deps PDF:    {dependencies_pdf_filename}\n")
-    
+
     # Step 1: Create/load course dictionary
     print("=" * 80)
     print("STEP 1: Creating/Loading Course Dictionary")
     print("=" * 80)
-    returncode, stdout, stderr = run_command(["python3", "create_course_dictionary.py", catalog_url])
-    if stdout: print(stdout)
-    if returncode != 0:
-        print(f"\n❌ ERROR: create_course_dictionary.py failed.\n{stderr}")
+    ok, error = run_step(create_course_dictionary.main, catalog_url)
+    if not ok:
+        print(f"\n❌ ERROR: create_course_dictionary failed.\n{error}")
         sys.exit(1)
     print("✓ Course dictionary ready\n")
-    
+
     # Step 2: Generate JSON summary
     print("=" * 80)
     print("STEP 2: Generating JSON Summary")
     print("=" * 80)
-    returncode, stdout, stderr = run_command(["python3", "get_catalog_summary_json.py", catalog_url])
-    if stdout: print(stdout)
-    if returncode != 0:
-        print(f"\n❌ ERROR: get_catalog_summary_json.py failed.\n{stderr}")
-        sys.exit(1)
-    print(f"✓ JSON summary generated: {json_filename}\n")
-    
+    if not force and up_to_date(json_filename, ser_filename):
+        print(f"✓ JSON summary up to date, skipping: {json_filename}\n")
+    else:
+        ok, error = run_step(get_catalog_summary_json.main, catalog_url)
+        if not ok:
+            print(f"\n❌ ERROR: get_catalog_summary_json failed.\n{error}")
+            sys.exit(1)
+        print(f"✓ JSON summary generated: {json_filename}\n")
+
     # Step 3: Print summary from JSON
     print("=" * 80)
     print("STEP 3: Printing Catalog Summary")
     print("=" * 80)
-    returncode, stdout, stderr = run_command(["python3", "print_catalog_summary.py", json_filename])
-    if stdout: print(stdout)
-    if returncode != 0:
-        print(f"\n❌ ERROR: print_catalog_summary.py failed.\n{stderr}")
+    ok, error = run_step(print_catalog_summary.main, json_filename)
+    if not ok:
+        print(f"\n❌ ERROR: print_catalog_summary failed.\n{error}")
         sys.exit(1)
     print("✓ Text summary printed successfully.\n")
 
-    # Step 4: Generate PDF
-    print("=" * 80)
-    print("STEP 4: Generating PDF Summary")
-    print("=" * 80)
-    returncode, stdout, stderr = run_command(["python3", "create_catalog_summary_pdf.py", json_filename])
-    if stdout: print(stdout)
-    if returncode != 0:
-        print(f"\n⚠️  Warning: PDF generation failed.\n{stderr}")
-    else:
-        print(f"✓ PDF summary generated: {pdf_filename}\n")
+    # Steps 4-7 only depend on the JSON summary, so the PDF, the
+    # DOT -> SVG chain and the dependency PDF render concurrently;
+    # results are reported in step order below. Outputs already newer
+    # than the JSON are not resubmitted unless --force is given.
+    with ProcessPoolExecutor(max_workers=3) as pool:
+        pdf_future = None
+        if force or not up_to_date(pdf_filename, json_filename):
+            pdf_future = pool.submit(run_stage_captured, "create_catalog_summary_pdf", json_filename)
 
-    # Step 5: Generate DOT graph from JSON
-    print("=" * 80)
-    print("STEP 5: Generating DOT Graph")
-    print("=" * 80)
-    returncode, stdout, stderr = run_command(["python3", "create_summary_graph.py", json_filename])
-    if stdout: print(stdout)
-    if returncode != 0:
-        print(f"\n❌ ERROR: create_summary_graph.py failed.\n{stderr}")
-        sys.exit(1)
-    print(f"✓ DOT graph generated: {dot_filename}\n")
+        graph_future = None
+        if force or not (up_to_date(dot_filename, json_filename)
+                         and up_to_date(svg_filename, dot_filename)):
+            graph_future = pool.submit(run_graph_stages, json_filename, dot_filename, svg_filename)
 
-    # Step 6: Generate SVG from DOT
-    print("=" * 80)
-    print("STEP 6: Generating SVG from DOT")
-    print("=" * 80)
-    returncode, stdout, stderr = run_command(["dot", "-Tsvg", dot_filename, "-o", svg_filename])
-    if stdout: print(stdout)
-    if returncode == -1:
-        print(f"\n⚠️  WARNING: Graphviz 'dot' command not found. Skipping SVG generation.")
-        print("   To install it, run: 'sudo apt-get install graphviz' or 'brew install graphviz'")
-    elif returncode != 0:
-        print(f"\n⚠️  WARNING: SVG generation failed.\n{stderr}")
-    else:
-        print(f"✓ SVG graph generated: {svg_filename}\n")
+        deps_future = None
+        if force or not up_to_date(dependencies_pdf_filename, json_filename):
+            deps_future = pool.submit(run_stage_captured, "get_dependencies_pdf", json_filename)
 
-    # Step 7: Generate Course Dependency PDF
-    print("=" * 80)
-    print("STEP 7: Generating Course Dependency PDF")
-    print("=" * 80)
-    returncode, stdout, stderr = run_command(["python3", "get_dependencies_pdf.py", json_filename])
-    if stdout: print(stdout)
-    if returncode != 0:
-        print(f"\n⚠️  Warning: Dependency PDF generation failed.\n{stderr}")
-    else:
-        print(f"✓ Dependency PDF generated: {dependencies_pdf_filename}\n")
+        # Step 4: Generate PDF
+        print("=" * 80)
+        print("STEP 4: Generating PDF Summary")
+        print("=" * 80)
+        if pdf_future is None:
+            print(f"✓ PDF summary up to date, skipping: {pdf_filename}\n")
+        else:
+            ok, error, output = pdf_future.result()
+            if output: print(output)
+            if not ok:
+                print(f"\n⚠️  Warning: PDF generation failed.\n{error}")
+            else:
+                print(f"✓ PDF summary generated: {pdf_filename}\n")
+
+        # Step 5: Generate DOT graph from JSON
+        print("=" * 80)
+        print("STEP 5: Generating DOT Graph")
+        print("=" * 80)
+        if graph_future is None:
+            dot_returncode, dot_stderr = 0, ""
+            print(f"✓ DOT graph up to date, skipping: {dot_filename}\n")
+        else:
+            ok, error, output, dot_returncode, dot_stderr = graph_future.result()
+            if output: print(output)
+            if not ok:
+                print(f"\n❌ ERROR: create_summary_graph failed.\n{error}")
+                sys.exit(1)
+            print(f"✓ DOT graph generated: {dot_filename}\n")
+
+        # Step 6: Generate SVG from DOT (external Graphviz binary)
+        print("=" * 80)
+        print("STEP 6: Generating SVG from DOT")
+        print("=" * 80)
+        if graph_future is None:
+            print(f"✓ SVG graph up to date, skipping: {svg_filename}\n")
+        elif dot_returncode == -1:
+            print(f"\n⚠️  WARNING: Graphviz 'dot' command not found. Skipping SVG generation.")
+            print("   To install it, run: 'sudo apt-get install graphviz' or 'brew install graphviz'")
+        elif dot_returncode != 0:
+            print(f"\n⚠️  WARNING: SVG generation failed.\n{dot_stderr}")
+        else:
+            print(f"✓ SVG graph generated: {svg_filename}\n")
+
+        # Step 7: Generate Course Dependency PDF
+        print("=" * 80)
+        print("STEP 7: Generating Course Dependency PDF")
+        print("=" * 80)
+        if deps_future is None:
+            print(f"✓ Dependency PDF up to date, skipping: {dependencies_pdf_filename}\n")
+        else:
+            ok, error, output = deps_future.result()
+            if output: print(output)
+            if not ok:
+                print(f"\n⚠️  Warning: Dependency PDF generation failed.\n{error}")
+            else:
+                print(f"✓ Dependency PDF generated: {dependencies_pdf_filename}\n")
 
     print("\n" + "=" * 80)
     print("✓ WORKFLOW COMPLETED")
@@ -127,4 +231,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
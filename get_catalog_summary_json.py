@@ -1,270 +1,285 @@
-#!/usr/bin/env python3
-
-import sys
-import pickle
-import os
-import json
-from urllib.parse import urlparse
-
-from catalog_util import (
-    get_json_filename,
-    get_ser_filename,
-    fetch_html,
-    get_sidebar_ul_links,
-    find_link,
-    extract_course_titles,
-    discover_candidate_school_urls,
-    filter_urls_by_sidebar    
-)
-
-# Get the serialized filename based on the catalog URL
-CATALOG_PAGE_WITH_SIDEBAR = sys.argv[1]
-COURSE_DICT_FILE = get_ser_filename(CATALOG_PAGE_WITH_SIDEBAR)
-
-def load_course_dictionary(filename: str = COURSE_DICT_FILE) -> dict:
-    """Load the course dictionary from a file if it exists."""
-    if os.path.exists(filename):
-        try:
-            with open(filename, 'rb') as f:
-                course_dict = pickle.load(f)
-            print(f"✓ Loaded course dictionary from {filename} ({len(course_dict)} courses)")
-            return course_dict
-        except Exception as e:
-            print(f"⚠️  Error loading course dictionary: {e}")
-            return {}
-    else:
-        print(f"❌ Course dictionary not found at {filename}")
-        print(f"   Please run create_course_dictionary.py first to build the dictionary.")
-        sys.exit(1)
-
-def extract_school_name(school_url: str) -> str:
-    """Extract the school name from the school's overview page."""
-    from bs4 import BeautifulSoup
-    
-    html = fetch_html(school_url)
-    if not html:
-        return "Unknown School"
-    
-    try:
-        soup = BeautifulSoup(html, "html.parser")
-        
-        # Try to find the page title or h1 heading
-        h1 = soup.find("h1")
-        if h1:
-            return h1.get_text(strip=True)
-        
-        # Fallback to page title
-        title = soup.find("title")
-        if title:
-            title_text = title.get_text(strip=True)
-            # Remove common suffixes like " | St. John Fisher University"
-            if "|" in title_text:
-                return title_text.split("|")[0].strip()
-            return title_text
-        
-        return "Unknown School"
-    except Exception as e:
-        print(f"      ⚠️  Error extracting school name from {school_url}: {e}")
-        return "Unknown School"
-
-def parse_prerequisite_courses(prereq_string: str, course_dict: dict) -> list[str]:
-    """Parse prerequisite string and extract course IDs."""
-    if not prereq_string:
-        return []
-    
-    import re
-    pattern = r'\b([A-Z]{3,4}[-\s]?\d{3}[A-Z]?)\b'
-    matches = re.findall(pattern, prereq_string.upper())
-    
-    prereq_courses = []
-    for match in matches:
-        normalized = match.replace(' ', '').replace('-', '')
-        
-        for course_id in course_dict.keys():
-            normalized_dict_id = course_id.replace(' ', '').replace('-', '').upper()
-            if normalized == normalized_dict_id:
-                prereq_courses.append(course_id)
-                break
-    
-    return prereq_courses
-
-def extract_course_ids_from_program_requirements(prog_req_url: str, course_dict: dict) -> list[str]:
-    """Extract course IDs from Program Requirements page."""
-    from bs4 import BeautifulSoup
-    import re
-    
-    html = fetch_html(prog_req_url)
-    if not html:
-        return []
-    
-    try:
-        soup = BeautifulSoup(html, "html.parser")
-        page_text = soup.get_text()
-        
-        pattern = r'\b([A-Z]{3,4}[-\s]?\d{3}[A-Z]?)\b'
-        matches = re.findall(pattern, page_text.upper())
-        
-        found_courses = []
-        seen = set()
-        
-        for match in matches:
-            normalized = match.replace(' ', '').replace('-', '')
-            
-            for course_id in course_dict.keys():
-                normalized_dict_id = course_id.replace(' ', '').replace('-', '').upper()
-                if normalized == normalized_dict_id and course_id not in seen:
-                    found_courses.append(course_id)
-                    seen.add(course_id)
-                    break
-        
-        return found_courses
-    except Exception as e:
-        print(f"        ⚠️  Error extracting courses from {prog_req_url}: {e}")
-        return []
-
-def save_to_json(data: dict, filename: str):
-    """Save the catalog summary data to a JSON file."""
-    try:
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-        print(f"✓ Summary saved to {filename}")
-    except Exception as e:
-        print(f"⚠️  Error saving JSON file: {e}")
-
-if __name__ == "__main__":
-    # Accept URL from command line or use default
-    if len(sys.argv) > 1:
-        CATALOG_PAGE_WITH_SIDEBAR = sys.argv[1]
-    else:
-        CATALOG_PAGE_WITH_SIDEBAR = "https://catalog.sjf.edu/2025-2026/"
-    
-    print(f"Generating JSON summary for: {CATALOG_PAGE_WITH_SIDEBAR}\n")
-
-    # Load course dictionary (required)
-    course_dictionary = load_course_dictionary()
-    
-    # Discover and filter school URLs
-    YOUR_URLS = discover_candidate_school_urls(CATALOG_PAGE_WITH_SIDEBAR)
-    
-    try:
-        filtered = filter_urls_by_sidebar(CATALOG_PAGE_WITH_SIDEBAR, YOUR_URLS)
-    except Exception as e:
-        print(f"Error: {e}")
-        raise
-
-    print(f"Discovered {len(YOUR_URLS)} candidate school URLs; {len(filtered)} appear in sidebar\n")
-    
-    # Collect course data
-    print("Collecting course data...\n")
-    all_courses_data = []
-    
-    for school_url in filtered:
-        sidebar_links = get_sidebar_ul_links(school_url)
-        
-        if not sidebar_links:
-            continue
-        
-        for nav_link in sidebar_links:
-            prog_req_link = find_link(nav_link['url'], "Program Requirements")
-            
-            if prog_req_link:
-                courses_link = find_link(nav_link['url'], "Courses")
-                if courses_link:
-                    course_data = extract_course_titles(courses_link)
-                    
-                    for course in course_data:
-                        all_courses_data.append({
-                            "school_url": school_url,
-                            "program_name": nav_link['text'],
-                            "prog_req_link": prog_req_link,
-                            "courses_link": courses_link,
-                            **course
-                        })
-    
-    # Build JSON structure
-    print("Building JSON structure...\n")
-    json_output = {
-        "catalog_url": CATALOG_PAGE_WITH_SIDEBAR,
-        "total_courses": len(all_courses_data),
-        "schools": []
-    }
-    
-    # Organize data by school and program for JSON
-    schools_dict = {}
-    
-    for course_data in all_courses_data:
-        school_url = course_data["school_url"]
-        program_name = course_data["program_name"]
-        
-        # Initialize school if not exists
-        if school_url not in schools_dict:
-            school_name = extract_school_name(school_url)
-            schools_dict[school_url] = {
-                "school_name": school_name,
-                "school_url": school_url,
-                "programs": {}
-            }
-        
-        # Initialize program if not exists
-        if program_name not in schools_dict[school_url]["programs"]:
-            prog_req_link = course_data.get('prog_req_link')
-            
-            # Get requirement courses
-            requirement_courses = []
-            if prog_req_link and prog_req_link != 'Not found':
-                req_course_ids = extract_course_ids_from_program_requirements(
-                    prog_req_link,
-                    course_dictionary
-                )
-                requirement_courses = [
-                    {
-                        "course_id": cid,
-                        "course_title": course_dictionary.get(cid, "Unknown")
-                    }
-                    for cid in req_course_ids
-                ]
-            
-            schools_dict[school_url]["programs"][program_name] = {
-                "program_name": program_name,
-                "program_requirements_url": prog_req_link if prog_req_link else "Not available",
-                "courses_url": course_data['courses_link'],
-                "requirement_courses": requirement_courses,
-                "program_courses": []
-            }
-        
-        # Add course to program
-        prereq_courses = parse_prerequisite_courses(
-            course_data.get("prerequisites", ""),
-            course_dictionary
-        )
-        
-        course_entry = {
-            "course_id": course_data["course_id"],
-            "course_title": course_data["course_title"],
-            "prerequisites": [
-                {
-                    "course_id": pid,
-                    "course_title": course_dictionary.get(pid, "Unknown")
-                }
-                for pid in prereq_courses
-            ] if prereq_courses else []
-        }
-        
-        schools_dict[school_url]["programs"][program_name]["program_courses"].append(course_entry)
-    
-    # Convert schools_dict to list format for JSON
-    for school_url, school_data in schools_dict.items():
-        school_entry = {
-            "school_name": school_data["school_name"],
-            "school_url": school_data["school_url"],
-            "programs": list(school_data["programs"].values())
-        }
-        json_output["schools"].append(school_entry)
-    
-    # Save to JSON file
-    json_filename = get_json_filename(sys.argv[1])
-    save_to_json(json_output, json_filename)
-    
-    print(f"\n✓ JSON generation complete!")
-    print(f"  Total schools: {len(json_output['schools'])}")
-    print(f"  Total courses: {json_output['total_courses']}")
\ No newline at end of file
+#!/usr/bin/env python3
+
+import functools
+import sys
+import orjson
+import os
+import re
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from catalog_util import (
+    get_json_filename,
+    get_ser_filename,
+    fetch_html,
+    crawl_catalog,
+    discover_candidate_school_urls,
+    filter_urls_by_sidebar
+)
+
+def load_course_dictionary(filename: str) -> dict:
+    """Load the course dictionary from a file if it exists."""
+    if os.path.exists(filename):
+        try:
+            with open(filename, 'rb') as f:
+                data = orjson.loads(f.read())
+            if "courses" in data and "normalized_index" in data:
+                # Current format: the normalized index was precomputed at
+                # catalog-build time, so seed the cache instead of
+                # re-normalizing every key here.
+                course_dict = data["courses"]
+                _NORMALIZED_INDEX_CACHE[id(course_dict)] = data["normalized_index"]
+            else:
+                # Legacy format: bare dictionary; the index is built
+                # lazily by get_normalized_index.
+                course_dict = data
+            print(f"✓ Loaded course dictionary from {filename} ({len(course_dict)} courses)")
+            return course_dict
+        except Exception as e:
+            print(f"⚠️  Error loading course dictionary: {e}")
+            return {}
+    else:
+        print(f"❌ Course dictionary not found at {filename}")
+        print(f"   Please run create_course_dictionary.py first to build the dictionary.")
+        sys.exit(1)
+
+# Course codes look like "ABC 123" / "ABCD-123A"; compiled once since the
+# pattern runs over every prerequisite string and requirements page.
+# Case-insensitive so inputs never need a full .upper() copy first; only
+# the short matched substrings get uppercased during normalization. No
+# capture group: findall returns the whole match either way, and the
+# groupless pattern skips the capture bookkeeping.
+COURSE_CODE_RE = re.compile(r'\b[A-Z]{3,4}[-\s]?\d{3}[A-Z]?\b', re.IGNORECASE)
+
+@functools.lru_cache(maxsize=None)
+def extract_school_name(school_url: str) -> str:
+    """Extract the school name from the school's overview page."""
+    from selectolax.lexbor import LexborHTMLParser
+
+    html = fetch_html(school_url)
+    if not html:
+        return "Unknown School"
+
+    try:
+        tree = LexborHTMLParser(html)
+
+        # Try to find the page title or h1 heading
+        h1 = tree.css_first("h1")
+        if h1:
+            return h1.text(strip=True)
+
+        # Fallback to page title
+        title = tree.css_first("title")
+        if title:
+            title_text = title.text(strip=True)
+            # Remove common suffixes like " | St. John Fisher University"
+            if "|" in title_text:
+                return title_text.split("|")[0].strip()
+            return title_text
+
+        return "Unknown School"
+    except Exception as e:
+        print(f"      ⚠️  Error extracting school name from {school_url}: {e}")
+        return "Unknown School"
+
+# Deletes spaces and hyphens in one C pass; ~2x faster than chained
+# str.replace on these short tokens.
+_STRIP_SEPARATORS = str.maketrans('', '', ' -')
+
+# Normalized-ID lookup tables, keyed by the identity of the course dict
+# they were built from. Matching a regex hit against the dictionary is a
+# single dict lookup instead of a scan over every known course.
+_NORMALIZED_INDEX_CACHE = {}
+
+def get_normalized_index(course_dict: dict) -> dict:
+    """Map normalized course IDs (uppercase, no spaces/hyphens) to dict keys."""
+    index = _NORMALIZED_INDEX_CACHE.get(id(course_dict))
+    if index is None:
+        index = {
+            cid.translate(_STRIP_SEPARATORS).upper(): cid
+            for cid in course_dict
+        }
+        _NORMALIZED_INDEX_CACHE[id(course_dict)] = index
+    return index
+
+def parse_prerequisite_courses(prereq_string: str, course_dict: dict) -> list[str]:
+    """Parse prerequisite string and extract course IDs."""
+    if not prereq_string:
+        return []
+
+    matches = COURSE_CODE_RE.findall(prereq_string)
+
+    normalized_index = get_normalized_index(course_dict)
+    prereq_courses = []
+    for match in matches:
+        course_id = normalized_index.get(match.translate(_STRIP_SEPARATORS).upper())
+        if course_id:
+            prereq_courses.append(course_id)
+
+    return prereq_courses
+
+# Requirement-course lists keyed by page URL. Programs can share a
+# requirements page, and the extraction depends only on the URL and the
+# (run-stable) course dictionary, so repeats skip the parse entirely.
+_REQUIREMENT_COURSES_BY_URL = {}
+
+def extract_course_ids_from_program_requirements(prog_req_url: str, course_dict: dict) -> list[str]:
+    """Extract course IDs from Program Requirements page."""
+    from lxml import html as lxml_html
+
+    cached = _REQUIREMENT_COURSES_BY_URL.get(prog_req_url)
+    if cached is not None:
+        return cached
+
+    html = fetch_html(prog_req_url)
+    if not html:
+        return []
+
+    try:
+        # text_content() assembles the page text in C; the regex then
+        # runs over it case-insensitively, so no uppercased copy of the
+        # whole page is ever made.
+        page_text = lxml_html.fromstring(html).text_content()
+
+        matches = COURSE_CODE_RE.findall(page_text)
+
+        normalized_index = get_normalized_index(course_dict)
+        found_courses = []
+        seen = set()
+
+        # Dedupe on the normalized token: popular intro courses repeat
+        # many times per page, and repeats skip the index lookup too.
+        for match in matches:
+            key = match.translate(_STRIP_SEPARATORS).upper()
+            if key in seen:
+                continue
+            seen.add(key)
+            course_id = normalized_index.get(key)
+            if course_id:
+                found_courses.append(course_id)
+
+        _REQUIREMENT_COURSES_BY_URL[prog_req_url] = found_courses
+        return found_courses
+    except Exception as e:
+        print(f"        ⚠️  Error extracting courses from {prog_req_url}: {e}")
+        return []
+
+def save_to_json(data: dict, filename: str):
+    """Save the catalog summary data to a JSON file."""
+    try:
+        with open(filename, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        print(f"✓ Summary saved to {filename}")
+    except Exception as e:
+        print(f"⚠️  Error saving JSON file: {e}")
+
+def main(catalog_url: str):
+    """Generate the JSON catalog summary for one catalog URL."""
+    print(f"Generating JSON summary for: {catalog_url}\n")
+
+    # Load course dictionary (required)
+    course_dictionary = load_course_dictionary(get_ser_filename(catalog_url))
+
+    # Discover and filter school URLs
+    YOUR_URLS = discover_candidate_school_urls(catalog_url)
+
+    try:
+        filtered = filter_urls_by_sidebar(catalog_url, YOUR_URLS)
+    except Exception as e:
+        print(f"Error: {e}")
+        raise
+
+    print(f"Discovered {len(YOUR_URLS)} candidate school URLs; {len(filtered)} appear in sidebar\n")
+    
+    # Collect course data via the shared thread-pooled crawl
+    print("Collecting course data...\n")
+    all_courses_data = crawl_catalog(filtered)
+
+    # Warm the school-name cache in parallel so the structuring loop
+    # below resolves each name with a cache hit instead of a serial
+    # fetch+parse.
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        for _ in pool.map(extract_school_name, filtered):
+            pass
+
+    # Build JSON structure
+    print("Building JSON structure...\n")
+    json_output = {
+        "catalog_url": catalog_url,
+        "total_courses": len(all_courses_data),
+        "schools": []
+    }
+    
+    # Group rows by school and program once, then emit each group.
+    # Avoids the per-row membership probes of building the nested dicts
+    # incrementally, and runs the requirement extraction exactly once
+    # per program.
+    grouped = defaultdict(lambda: defaultdict(list))
+    for course_data in all_courses_data:
+        grouped[course_data.school_url][course_data.program_name].append(course_data)
+
+    for school_url, programs in grouped.items():
+        school_entry = {
+            "school_name": extract_school_name(school_url),
+            "school_url": school_url,
+            "programs": []
+        }
+
+        for program_name, rows in programs.items():
+            # The field is always set by crawl_catalog.
+            prog_req_link = rows[0].prog_req_link
+
+            # Get requirement courses
+            requirement_courses = []
+            if prog_req_link:
+                req_course_ids = extract_course_ids_from_program_requirements(
+                    prog_req_link,
+                    course_dictionary
+                )
+                requirement_courses = [
+                    {
+                        "course_id": cid,
+                        "course_title": course_dictionary.get(cid, "Unknown")
+                    }
+                    for cid in req_course_ids
+                ]
+
+            program_courses = []
+            for course_data in rows:
+                prereq_courses = parse_prerequisite_courses(
+                    course_data.prerequisites,
+                    course_dictionary
+                )
+
+                program_courses.append({
+                    "course_id": course_data.course_id,
+                    "course_title": course_data.course_title,
+                    "prerequisites": [
+                        {
+                            "course_id": pid,
+                            "course_title": course_dictionary.get(pid, "Unknown")
+                        }
+                        for pid in prereq_courses
+                    ] if prereq_courses else []
+                })
+
+            school_entry["programs"].append({
+                "program_name": program_name,
+                "program_requirements_url": prog_req_link if prog_req_link else "Not available",
+                "courses_url": rows[0].courses_link,
+                "requirement_courses": requirement_courses,
+                "program_courses": program_courses
+            })
+
+        json_output["schools"].append(school_entry)
+
+    # Save to JSON file
+    json_filename = get_json_filename(catalog_url)
+    save_to_json(json_output, json_filename)
+
+    print(f"\n✓ JSON generation complete!")
+    print(f"  Total schools: {len(json_output['schools'])}")
+    print(f"  Total courses: {json_output['total_courses']}")
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else "https://catalog.sjf.edu/2025-2026/")
\ No newline at end of file
@@ -1,8 +1,9 @@
 #!/usr/bin/env python3
 
 import sys
-import json
+import orjson
 import os
+from xml.sax.saxutils import escape
 from reportlab.lib.pagesizes import letter
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
@@ -15,11 +16,11 @@ def load_json_summary(filename: str) -> dict:
         sys.exit(1)
     
     try:
-        with open(filename, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        with open(filename, 'rb') as f:
+            data = orjson.loads(f.read())
         print(f"✓ Loaded catalog summary from {filename}")
         return data
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         print(f"❌ Error parsing JSON file: {e}")
         sys.exit(1)
     except Exception as e:
@@ -52,7 +53,7 @@ def build_dependency_maps(data: dict) -> tuple[dict, dict, dict]:
                 course_id = req_course.get('course_id')
                 if course_id:
                     all_courses[course_id] = req_course.get('course_title', 'Unknown Title')
-                    required_by.setdefault(course_id, set()).add(program_name)
+                    required_by.setdefault(course_id, []).append(program_name)
 
             # Map prerequisites
             for course in program.get('program_courses', []):
@@ -63,8 +64,13 @@ def build_dependency_maps(data: dict) -> tuple[dict, dict, dict]:
                         prereq_id = prereq.get('course_id')
                         if prereq_id:
                             # The key is the prerequisite, the value is the course that depends on it
-                            prereq_for.setdefault(prereq_id, set()).add(course_id)
-    
+                            prereq_for.setdefault(prereq_id, []).append(course_id)
+
+    # Dedupe and sort each dependency list once here, so the PDF walk
+    # can iterate them directly instead of sorting per course.
+    required_by = {k: sorted(set(v)) for k, v in required_by.items()}
+    prereq_for = {k: sorted(set(v)) for k, v in prereq_for.items()}
+
     return all_courses, required_by, prereq_for
 
 def create_dependencies_pdf(all_courses: dict, required_by: dict, prereq_for: dict, pdf_filename: str):
@@ -77,31 +83,45 @@ def create_dependencies_pdf(all_courses: dict, required_by: dict, prereq_for: di
     dependency_header_style = ParagraphStyle('DependencyHeader', parent=styles['h3'], leftIndent=18, spaceAfter=2)
     list_item_style = ParagraphStyle('ListItem', parent=styles['Normal'], leftIndent=36)
     
+    # Constant flowables hoisted out of the loop; headers and the
+    # no-dependency note render identically for every course.
+    required_by_header = Paragraph("Required By Programs:", dependency_header_style)
+    prereq_for_header = Paragraph("Prerequisite For:", dependency_header_style)
+    no_dependencies = Paragraph("<i>No dependencies found in other programs or courses.</i>", list_item_style)
+
     story = [Paragraph("Course Dependency Analysis", styles['h1'])]
-    
+
     # Sort courses alphabetically by ID
     sorted_course_ids = sorted(all_courses.keys())
-    
+
     for course_id in sorted_course_ids:
         course_title = all_courses[course_id]
-        story.append(Paragraph(f"{course_id}: {course_title}", course_header_style))
-        
-        # List programs that require this course
+        story.append(Paragraph(escape(f"{course_id}: {course_title}"), course_header_style))
+
+        # List programs that require this course. One merged Paragraph
+        # per list keeps the flowable count (and layout cost) per course
+        # instead of per bullet.
         if course_id in required_by:
-            story.append(Paragraph("Required By Programs:", dependency_header_style))
-            for program_name in sorted(list(required_by[course_id])):
-                story.append(Paragraph(f"• {program_name}", list_item_style))
-        
+            story.append(required_by_header)
+            story.append(Paragraph(
+                '<br/>'.join(f"• {escape(program_name)}" for program_name in required_by[course_id]),
+                list_item_style
+            ))
+
         # List courses that use this as a prerequisite
         if course_id in prereq_for:
-            story.append(Paragraph("Prerequisite For:", dependency_header_style))
-            for dependent_course_id in sorted(list(prereq_for[course_id])):
-                dependent_title = all_courses.get(dependent_course_id, "Unknown Title")
-                story.append(Paragraph(f"• {dependent_course_id}: {dependent_title}", list_item_style))
-        
+            story.append(prereq_for_header)
+            story.append(Paragraph(
+                '<br/>'.join(
+                    f"• {escape(dependent_course_id)}: {escape(all_courses.get(dependent_course_id, 'Unknown Title'))}"
+                    for dependent_course_id in prereq_for[course_id]
+                ),
+                list_item_style
+            ))
+
         # Add a small spacer if no dependencies were found for this course
         if course_id not in required_by and course_id not in prereq_for:
-            story.append(Paragraph("<i>No dependencies found in other programs or courses.</i>", list_item_style))
+            story.append(no_dependencies)
 
     try:
         doc.build(story)
@@ -110,21 +130,21 @@ def create_dependencies_pdf(all_courses: dict, required_by: dict, prereq_for: di
         print(f"❌ Error creating PDF: {e}")
         sys.exit(1)
 
+def main(json_filename: str):
+    """Load a summary JSON file and render the dependency PDF."""
+    catalog_data = load_json_summary(json_filename)
+    all_courses, required_by, prereq_for = build_dependency_maps(catalog_data)
+
+    pdf_filename = get_pdf_filename(json_filename)
+    print(f"Creating dependency PDF: {pdf_filename}")
+    create_dependencies_pdf(all_courses, required_by, prereq_for, pdf_filename)
+
 if __name__ == "__main__":
     if len(sys.argv) < 2:
         print("Usage: python get_dependencies_pdf.py <json_summary_file>")
         print("\nExample:")
         print("  python get_dependencies_pdf.py 2025-2026_undergraduate.json")
         sys.exit(1)
-    
-    json_filename = sys.argv[1]
-    
-    # Load and process the data
-    catalog_data = load_json_summary(json_filename)
-    all_courses, required_by, prereq_for = build_dependency_maps(catalog_data)
-    
-    # Generate the PDF
-    pdf_filename = get_pdf_filename(json_filename)
-    print(f"Creating dependency PDF: {pdf_filename}")
-    create_dependencies_pdf(all_courses, required_by, prereq_for, pdf_filename)
+
+    main(sys.argv[1])
     
\ No newline at end of file
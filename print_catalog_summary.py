@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 
 import sys
-import json
+import orjson
 import os
 
 def load_json_summary(filename: str) -> dict:
@@ -10,13 +10,13 @@ def load_json_summary(filename: str) -> dict:
         print(f"❌ JSON file not found: {filename}")
         print(f"   Please run get_catalog_summary_json.py first to generate the JSON file.")
         sys.exit(1)
-    
+
     try:
-        with open(filename, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        with open(filename, 'rb') as f:
+            data = orjson.loads(f.read())
         print(f"✓ Loaded catalog summary from {filename}")
         return data
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         print(f"❌ Error parsing JSON file: {e}")
         sys.exit(1)
     except Exception as e:
@@ -25,68 +25,80 @@ def load_json_summary(filename: str) -> dict:
 
 def print_catalog_summary(data: dict):
     """Print the catalog summary in the same format as summarize_catalog.py"""
-    
-    print(f"\nAnalyzing: {data.get('catalog_url', 'Unknown')}\n")
-    print(f"Total courses in catalog: {data.get('total_courses', 0)}\n")
-    print("=" * 80)
-    
-    print("\n🔍 Program Courses and prerequisite relationships...\n")
-    print("=" * 80)
-    
+
+    # Accumulate lines and write once at the end: one syscall instead of
+    # one per print() for catalogs with thousands of course rows.
+    out = []
+    w = out.append
+
+    w(f"\nAnalyzing: {data.get('catalog_url', 'Unknown')}\n")
+    w(f"Total courses in catalog: {data.get('total_courses', 0)}\n")
+    w("=" * 80)
+
+    w("\n🔍 Program Courses and prerequisite relationships...\n")
+    w("=" * 80)
+
     schools = data.get('schools', [])
-    
+
     for school in schools:
         school_name = school.get('school_name', 'Unknown School')
         school_url = school.get('school_url', 'Unknown URL')
-        
-        print(f"\n📚 School: {school_name}")
-        print(f"    Overview: {school_url}")
-        print("-" * 80)
-        
+
+        w(f"\n📚 School: {school_name}")
+        w(f"    Overview: {school_url}")
+        w("-" * 80)
+
         programs = school.get('programs', [])
-        
+
         for program in programs:
             program_name = program.get('program_name', 'Unknown Program')
             prog_req_url = program.get('program_requirements_url', 'Not available')
             courses_url = program.get('courses_url', 'Not available')
             requirement_courses = program.get('requirement_courses', [])
             program_courses = program.get('program_courses', [])
-            
-            print(f"\n  📄 Program: {program_name}")
-            
+
+            w(f"\n  📄 Program: {program_name}")
+
             # Display requirement courses
             if requirement_courses:
-                print(f"\n      📋 Requirement Courses ({len(requirement_courses)}): {prog_req_url}")
+                w(f"\n      📋 Requirement Courses ({len(requirement_courses)}): {prog_req_url}")
                 for req_course in requirement_courses:
                     course_id = req_course.get('course_id', 'Unknown')
                     course_title = req_course.get('course_title', 'Unknown')
-                    print(f'        • "{course_id}": "{course_title}"')
+                    w(f'        • "{course_id}": "{course_title}"')
             elif prog_req_url != 'Not available':
-                print(f"\n      📋 Requirement Courses: None found ({prog_req_url})")
+                w(f"\n      📋 Requirement Courses: None found ({prog_req_url})")
             else:
-                print(f"\n      📋 Requirement Courses: Not available")
-            
-            print(f"\n      Courses URL: {courses_url}")
-            print(f"\n      📚 Program Courses:")
-            print()
-            
+                w(f"\n      📋 Requirement Courses: Not available")
+
+            w(f"\n      Courses URL: {courses_url}")
+            w(f"\n      📚 Program Courses:")
+            w("")
+
             # Display program courses
             for course in program_courses:
                 course_id = course.get('course_id', 'Unknown')
                 course_title = course.get('course_title', 'Unknown')
                 prerequisites = course.get('prerequisites', [])
-                
-                print(f'        • "{course_id}", "{course_title}"')
-                
+
+                w(f'        • "{course_id}", "{course_title}"')
+
                 # Display prerequisites if any
                 if prerequisites:
-                    print(f"          Prerequisites:")
+                    w(f"          Prerequisites:")
                     for prereq in prerequisites:
                         prereq_id = prereq.get('course_id', 'Unknown')
                         prereq_title = prereq.get('course_title', 'Unknown')
-                        print(f'            - "{prereq_id}": "{prereq_title}"')
-                
-                print()
+                        w(f'            - "{prereq_id}": "{prereq_title}"')
+
+                w("")
+
+    sys.stdout.write('\n'.join(out) + '\n')
+
+def main(json_filename: str):
+    """Load a summary JSON file and print it."""
+    catalog_data = load_json_summary(json_filename)
+    print_catalog_summary(catalog_data)
 
 if __name__ == "__main__":
     # Check for JSON filename argument
@@ -95,11 +107,5 @@ if __name__ == "__main__":
         print("\nExample:")
         print("  python print_catalog_summary.py 2025-2026_summary.json")
         sys.exit(1)
-    
-    json_filename = sys.argv[1]
-    
-    # Load JSON data
-    catalog_data = load_json_summary(json_filename)
-    
-    # Print the summary
-    print_catalog_summary(catalog_data)
\ No newline at end of file
+
+    main(sys.argv[1])
\ No newline at end of file
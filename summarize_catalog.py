@@ -1,29 +1,37 @@
 #!/usr/bin/env python3
 
+import functools
 import sys
-import pickle
+import orjson
 import os
+import re
+from itertools import groupby
+from operator import attrgetter
 
-# Import common functions from create_course_dictionary
-from create_course_dictionary import (
-    COURSE_DICT_FILE,
-    normalize_url,
+from catalog_util import (
+    get_ser_filename,
     fetch_html,
-    get_sidebar_links,
-    get_sidebar_ul_links,
-    find_link,
-    remove_parenthetical,
-    extract_course_titles,
+    crawl_catalog,
     discover_candidate_school_urls,
     filter_urls_by_sidebar
 )
 
-def load_course_dictionary(filename: str = COURSE_DICT_FILE) -> dict:
+def load_course_dictionary(filename: str) -> dict:
     """Load the course dictionary from a file if it exists."""
     if os.path.exists(filename):
         try:
             with open(filename, 'rb') as f:
-                course_dict = pickle.load(f)
+                data = orjson.loads(f.read())
+            if "courses" in data and "normalized_index" in data:
+                # Current format: the normalized index was precomputed at
+                # catalog-build time, so seed the cache instead of
+                # re-normalizing every key here.
+                course_dict = data["courses"]
+                _NORMALIZED_INDEX_CACHE[id(course_dict)] = data["normalized_index"]
+            else:
+                # Legacy format: bare dictionary; the index is built
+                # lazily by get_normalized_index.
+                course_dict = data
             print(f"✓ Loaded course dictionary from {filename} ({len(course_dict)} courses)")
             return course_dict
         except Exception as e:
@@ -34,86 +42,122 @@ def load_course_dictionary(filename: str = COURSE_DICT_FILE) -> dict:
         print(f"   Please run create_course_dictionary.py first to build the dictionary.")
         sys.exit(1)
 
+# Course codes look like "ABC 123" / "ABCD-123A"; compiled once since the
+# pattern runs over every prerequisite string and requirements page.
+# Case-insensitive so inputs never need a full .upper() copy first; only
+# the short matched substrings get uppercased during normalization. No
+# capture group: findall returns the whole match either way, and the
+# groupless pattern skips the capture bookkeeping.
+COURSE_CODE_RE = re.compile(r'\b[A-Z]{3,4}[-\s]?\d{3}[A-Z]?\b', re.IGNORECASE)
+
+@functools.lru_cache(maxsize=None)
 def extract_school_name(school_url: str) -> str:
     """Extract the school name from the school's overview page."""
-    from bs4 import BeautifulSoup
-    
+    from selectolax.lexbor import LexborHTMLParser
+
     html = fetch_html(school_url)
     if not html:
         return "Unknown School"
-    
+
     try:
-        soup = BeautifulSoup(html, "html.parser")
-        
+        tree = LexborHTMLParser(html)
+
         # Try to find the page title or h1 heading
-        h1 = soup.find("h1")
+        h1 = tree.css_first("h1")
         if h1:
-            return h1.get_text(strip=True)
-        
+            return h1.text(strip=True)
+
         # Fallback to page title
-        title = soup.find("title")
+        title = tree.css_first("title")
         if title:
-            title_text = title.get_text(strip=True)
+            title_text = title.text(strip=True)
             # Remove common suffixes like " | St. John Fisher University"
             if "|" in title_text:
                 return title_text.split("|")[0].strip()
             return title_text
-        
+
         return "Unknown School"
     except Exception as e:
         print(f"      ⚠️  Error extracting school name from {school_url}: {e}")
         return "Unknown School"
 
+# Deletes spaces and hyphens in one C pass; ~2x faster than chained
+# str.replace on these short tokens.
+_STRIP_SEPARATORS = str.maketrans('', '', ' -')
+
+# Normalized-ID lookup tables, keyed by the identity of the course dict
+# they were built from. Matching a regex hit against the dictionary is a
+# single dict lookup instead of a scan over every known course.
+_NORMALIZED_INDEX_CACHE = {}
+
+def get_normalized_index(course_dict: dict) -> dict:
+    """Map normalized course IDs (uppercase, no spaces/hyphens) to dict keys."""
+    index = _NORMALIZED_INDEX_CACHE.get(id(course_dict))
+    if index is None:
+        index = {
+            cid.translate(_STRIP_SEPARATORS).upper(): cid
+            for cid in course_dict
+        }
+        _NORMALIZED_INDEX_CACHE[id(course_dict)] = index
+    return index
+
 def parse_prerequisite_courses(prereq_string: str, course_dict: dict) -> list[str]:
     """Parse prerequisite string and extract course IDs."""
     if not prereq_string:
         return []
-    
-    import re
-    pattern = r'\b([A-Z]{3,4}[-\s]?\d{3}[A-Z]?)\b'
-    matches = re.findall(pattern, prereq_string.upper())
-    
+
+    matches = COURSE_CODE_RE.findall(prereq_string)
+
+    normalized_index = get_normalized_index(course_dict)
     prereq_courses = []
     for match in matches:
-        normalized = match.replace(' ', '').replace('-', '')
-        
-        for course_id in course_dict.keys():
-            normalized_dict_id = course_id.replace(' ', '').replace('-', '').upper()
-            if normalized == normalized_dict_id:
-                prereq_courses.append(course_id)
-                break
-    
+        course_id = normalized_index.get(match.translate(_STRIP_SEPARATORS).upper())
+        if course_id:
+            prereq_courses.append(course_id)
+
     return prereq_courses
 
+# Requirement-course lists keyed by page URL. Programs can share a
+# requirements page, and the extraction depends only on the URL and the
+# (run-stable) course dictionary, so repeats skip the parse entirely.
+_REQUIREMENT_COURSES_BY_URL = {}
+
 def extract_course_ids_from_program_requirements(prog_req_url: str, course_dict: dict) -> list[str]:
     """Extract course IDs from Program Requirements page."""
-    from bs4 import BeautifulSoup
-    import re
-    
+    from lxml import html as lxml_html
+
+    cached = _REQUIREMENT_COURSES_BY_URL.get(prog_req_url)
+    if cached is not None:
+        return cached
+
     html = fetch_html(prog_req_url)
     if not html:
         return []
-    
+
     try:
-        soup = BeautifulSoup(html, "html.parser")
-        page_text = soup.get_text()
-        
-        pattern = r'\b([A-Z]{3,4}[-\s]?\d{3}[A-Z]?)\b'
-        matches = re.findall(pattern, page_text.upper())
-        
+        # text_content() assembles the page text in C; the regex then
+        # runs over it case-insensitively, so no uppercased copy of the
+        # whole page is ever made.
+        page_text = lxml_html.fromstring(html).text_content()
+
+        matches = COURSE_CODE_RE.findall(page_text)
+
+        normalized_index = get_normalized_index(course_dict)
         found_courses = []
         seen = set()
-        
+
+        # Dedupe on the normalized token: popular intro courses repeat
+        # many times per page, and repeats skip the index lookup too.
         for match in matches:
-            normalized = match.replace(' ', '').replace('-', '')
-            
-            for course_id in course_dict.keys():
-                normalized_dict_id = course_id.replace(' ', '').replace('-', '').upper()
-                if normalized == normalized_dict_id and course_id not in seen:
-                    found_courses.append(course_id)
-                    seen.add(course_id)
-                    break
-        
+            key = match.translate(_STRIP_SEPARATORS).upper()
+            if key in seen:
+                continue
+            seen.add(key)
+            course_id = normalized_index.get(key)
+            if course_id:
+                found_courses.append(course_id)
+
+        _REQUIREMENT_COURSES_BY_URL[prog_req_url] = found_courses
         return found_courses
     except Exception as e:
         print(f"        ⚠️  Error extracting courses from {prog_req_url}: {e}")
@@ -129,11 +173,11 @@ if __name__ == "__main__":
     print(f"Analyzing: {CATALOG_PAGE_WITH_SIDEBAR}\n")
 
     # Load course dictionary (required)
-    course_dictionary = load_course_dictionary()
-    
+    course_dictionary = load_course_dictionary(get_ser_filename(CATALOG_PAGE_WITH_SIDEBAR))
+
     # Discover and filter school URLs
-    YOUR_URLS = discover_candidate_school_urls(CATALOG_PAGE_WITH_SIDEBAR, include_grad=False)
-    
+    YOUR_URLS = discover_candidate_school_urls(CATALOG_PAGE_WITH_SIDEBAR)
+
     try:
         filtered = filter_urls_by_sidebar(CATALOG_PAGE_WITH_SIDEBAR, YOUR_URLS)
     except Exception as e:
@@ -142,93 +186,82 @@ if __name__ == "__main__":
 
     print(f"Discovered {len(YOUR_URLS)} candidate school URLs; {len(filtered)} appear in sidebar\n")
     print("=" * 80)
-    
-# Collect course data for display
-print("\nCollecting course data for analysis...\n")
-all_courses_data = []
 
-for school_url in filtered:
-    sidebar_links = get_sidebar_ul_links(school_url)
-    
-    if not sidebar_links:
-        continue
-    
-    for nav_link in sidebar_links:
-        prog_req_link = find_link(nav_link['url'], "Program Requirements")
-        
-        if prog_req_link:
-            courses_link = find_link(nav_link['url'], "Courses")
-            if courses_link:
-                course_data = extract_course_titles(courses_link)
-                
-                for course in course_data:
-                    all_courses_data.append({
-                        "school_url": school_url,
-                        "program_name": nav_link['text'],
-                        "prog_req_link": prog_req_link,
-                        "courses_link": courses_link,
-                        **course
-                    })
-    
+    # Collect course data for display via the shared crawl pass
+    print("\nCollecting course data for analysis...\n")
+    all_courses_data = crawl_catalog(filtered)
+
     print("=" * 80)
-    
+
     # PHASE 2: Display Program Courses with prerequisite relationships
     print("\n🔍 PHASE 2: Program Courses and prerequisite relationships...\n")
     print("=" * 80)
 
-    current_school = None
-    current_program = None
-    
-    for course_data in all_courses_data:
-        # Print school header if changed
-        if current_school != course_data["school_url"]:
-            current_school = course_data["school_url"]
-            school_name = extract_school_name(current_school)
-            print(f"\n📚 School: {school_name}")
-            print(f"    Overview: {current_school}")
-            print("-" * 80)
-        
-        # Print program header if changed
-        if current_program != course_data["program_name"]:
-            current_program = course_data["program_name"]
-            print(f"\n  📄 Program: {current_program}")
+    # Courses often share identical prerequisite text (e.g. a whole
+    # sequence requiring the same intro course); resolve each unique
+    # string once up front and look the results up per row below.
+    unique_prereqs = {c.prerequisites for c in all_courses_data if c.prerequisites}
+    prereq_cache = {
+        prereq: parse_prerequisite_courses(prereq, course_dictionary)
+        for prereq in unique_prereqs
+    }
+
+    # Sort once so rows for the same school and program are contiguous;
+    # groupby then replaces the per-row "did the header change?" string
+    # comparisons and makes the grouping contract explicit.
+    all_courses_data.sort(key=attrgetter('school_url', 'program_name'))
+
+    # Accumulate display lines and write once at the end: one syscall
+    # instead of one per print() for catalogs with thousands of rows.
+    out = []
+    w = out.append
+
+    for school_url, school_rows in groupby(all_courses_data, key=attrgetter('school_url')):
+        school_name = extract_school_name(school_url)
+        w(f"\n📚 School: {school_name}")
+        w(f"    Overview: {school_url}")
+        w("-" * 80)
+
+        for program_name, program_rows in groupby(school_rows, key=attrgetter('program_name')):
+            rows = list(program_rows)
+            w(f"\n  📄 Program: {program_name}")
 
             # Extract and display Requirement Courses from Program Requirements page
-            prog_req_link = course_data.get('prog_req_link')
-            if prog_req_link and prog_req_link != 'Not found':
+            # (the field is always set by crawl_catalog)
+            prog_req_link = rows[0].prog_req_link
+            if prog_req_link:
                 required_courses = extract_course_ids_from_program_requirements(
                     prog_req_link,
                     course_dictionary
                 )
-        
+
                 if required_courses:
-                    print(f"\n      📋 Program Requirement Courses ({len(required_courses)}) '{prog_req_link}':")
+                    w(f"\n      📋 Program Requirement Courses ({len(required_courses)}) '{prog_req_link}':")
                     for course_id in required_courses:
                         course_title = course_dictionary.get(course_id, "Unknown")
-                        print(f'        • "{course_id}": "{course_title}"')
+                        w(f'        • "{course_id}": "{course_title}"')
                 else:
-                    print(f"\n      📋 Program Requirement Courses: None found ({prog_req_link})")
+                    w(f"\n      📋 Program Requirement Courses: None found ({prog_req_link})")
             else:
-                print(f"\n      📋 Program Requirement Courses: Not available")
-
-            print(f"\n      📚 Program Courses '{course_data['courses_link']}':")
-            print()
-        
-        # Display course information
-        print(f'        • "{course_data["course_id"]}", "{course_data["course_title"]}"')
-        
-        # Parse and display prerequisite courses (only if found in dictionary)
-        if course_data["prerequisites"]:
-            prereq_courses = parse_prerequisite_courses(
-                course_data["prerequisites"], 
-                course_dictionary
-            )
-            
-            # Only display prerequisites if we found valid courses in the dictionary
-            if prereq_courses:
-                print(f"          Prerequisites:") 
-                for prereq_id in prereq_courses:
-                    prereq_title = course_dictionary.get(prereq_id, "Unknown")
-                    print(f'            - "{prereq_id}": "{prereq_title}"') 
-        
-        print()
\ No newline at end of file
+                w(f"\n      📋 Program Requirement Courses: Not available")
+
+            w(f"\n      📚 Program Courses '{rows[0].courses_link}':")
+            w("")
+
+            for course_data in rows:
+                # Display course information
+                w(f'        • "{course_data.course_id}", "{course_data.course_title}"')
+
+                # Display prerequisite courses (only if found in dictionary)
+                if course_data.prerequisites:
+                    prereq_courses = prereq_cache[course_data.prerequisites]
+
+                    if prereq_courses:
+                        w(f"          Prerequisites:")
+                        for prereq_id in prereq_courses:
+                            prereq_title = course_dictionary.get(prereq_id, "Unknown")
+                            w(f'            - "{prereq_id}": "{prereq_title}"')
+
+                w("")
+
+    sys.stdout.write('\n'.join(out) + '\n')
\ No newline at end of file